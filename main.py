@@ -41,13 +41,24 @@ def setup_logging():
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
     )
 
+_configs_initialized = False
+
 def create_default_configs():
     """Create default configuration files if they don't exist"""
-    os.makedirs("config", exist_ok=True)
-    
+    global _configs_initialized
+    if _configs_initialized:
+        return
+
+    # One scandir replaces the per-file existence checks
+    try:
+        existing = {entry.name for entry in os.scandir("config")}
+    except FileNotFoundError:
+        os.makedirs("config", exist_ok=True)
+        existing = set()
+
     # Portfolio configuration
     portfolio_config_path = "config/portfolio_config.json"
-    if not os.path.exists(portfolio_config_path):
+    if "portfolio_config.json" not in existing:
         default_portfolio = {
             "USDC": 0.25,
             "WETH": 0.50,
@@ -59,7 +70,7 @@ def create_default_configs():
     
     # Strategy configuration
     strategy_config_path = "config/strategy_config.json"
-    if not os.path.exists(strategy_config_path):
+    if "strategy_config.json" not in existing:
         default_strategies = {
             "active_strategies": ["momentum", "volatility"],
             "strategy_weights": {
@@ -78,6 +89,8 @@ def create_default_configs():
             json.dump(default_strategies, f, indent=2)
         logger.info(f"Created default strategy config: {strategy_config_path}")
 
+    _configs_initialized = True
+
 def run_basic_agent():
     """Run the basic trading agent"""
     logger.info("Starting Basic Trading Agent...")
@@ -86,11 +99,10 @@ def run_basic_agent():
     
     # Show agent info
     info = agent.get_agent_info()
-    if info.get("success"):
-        agent_data = info.get("agent", {})
-        logger.info(f"Agent: {agent_data.get('name', 'Unknown')}")
-        logger.info(f"Status: {agent_data.get('status', 'Unknown')}")
-        logger.info(f"Verified: {agent_data.get('isVerified', False)}")
+    if info.success:
+        logger.info(f"Agent: {info.name}")
+        logger.info(f"Status: {info.status}")
+        logger.info(f"Verified: {info.is_verified}")
     
     # Run single cycle
     agent.run_single_cycle()
@@ -116,18 +128,14 @@ def run_strategy_test():
     """Test trading strategies"""
     logger.info("Testing Trading Strategies...")
     
-    from src.data.market_data import MarketDataProvider
+    from src.data.market_data import get_market_provider
     
     # Get market data
-    market_data_provider = MarketDataProvider()
+    market_data_provider = get_market_provider()
     symbols = ["WETH", "WBTC", "USDC"]
     
-    market_data = {}
-    for symbol in symbols:
-        data = market_data_provider.get_market_data(symbol)
-        if data:
-            market_data[symbol] = data
-    
+    market_data = market_data_provider.get_market_data_batch(symbols)
+
     if not market_data:
         logger.error("Could not fetch market data for strategy testing")
         return
@@ -207,12 +215,22 @@ def main():
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         help="Logging level"
     )
-    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Clear persisted market-data caches before starting"
+    )
+
     args = parser.parse_args()
-    
+
     # Setup
     setup_logging()
     create_default_configs()
+
+    if args.no_cache:
+        from src.data.market_data import get_market_provider
+        get_market_provider().clear_caches()
+        logger.info("Cleared persisted market-data caches")
     
     # Validate API key
     if not config.recall_api_key:
@@ -2,23 +2,106 @@
 Basic Trading Agent for Recall Network
 Implements simple trading strategies and portfolio management
 """
-import json
+import os
 import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Dict, List, Optional
 from loguru import logger
 
-from ..utils.config import config, get_token_address
-from ..utils.recall_client import RecallClient
-from ..data.market_data import MarketDataProvider
+from ..utils import json_utils
+from ..utils.config import config, get_token_address, TOKEN_CONFIG
+from ..utils.jit import njit
+from ..utils.recall_client import AgentProfile, get_recall_client
+from ..data.market_data import get_market_provider
+
+# Explicit signature compiles the kernel at import (and caches it to
+# disk), so the first rebalance does not pay JIT latency. Set
+# WARMUP_JIT=0 to defer compilation to first use instead.
+_REBALANCE_SIG = ('Tuple((float64[:], float64[:], boolean[:], float64[:]))'
+                  '(float64[:], float64[:], float64[:], float64, float64)')
+_sig_args = (_REBALANCE_SIG,) if os.environ.get("WARMUP_JIT", "1") != "0" else ()
+
+@njit(*_sig_args, cache=True, fastmath=True)
+def _rebalance_kernel(values, target_weights, prices, total_value, threshold):
+    """Pure-numeric rebalancing math, JIT-compiled when numba is available"""
+    current_weights = values / total_value
+    weight_diffs = current_weights - target_weights
+    mask = (np.abs(weight_diffs) >= threshold) & (prices > 0)
+    amounts = np.abs(values - total_value * target_weights)
+    return current_weights, weight_diffs, mask, amounts
+
+@dataclass
+class PortfolioSnapshot:
+    """Struct-of-arrays snapshot of the portfolio at a point in time
+
+    Numeric fields live in aligned NumPy arrays so downstream math can
+    stay vectorized; the nested-dict shape older callers expect is built
+    lazily via ``snapshot["portfolio"]``.
+    """
+    symbols: List[str]
+    balances: np.ndarray
+    prices: np.ndarray
+    values: np.ndarray
+    allocations: np.ndarray
+    total_value: float
+    timestamp: float
+    index: Dict[str, int] = field(init=False, repr=False)
+    _portfolio_view: Optional[Dict[str, Dict[str, float]]] = field(
+        default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+
+    @property
+    def portfolio(self) -> Dict[str, Dict[str, float]]:
+        """Per-symbol dict view, constructed on first access"""
+        if self._portfolio_view is None:
+            self._portfolio_view = {
+                symbol: {
+                    "balance": float(self.balances[i]),
+                    "price": float(self.prices[i]),
+                    "value": float(self.values[i]),
+                    "allocation": float(self.allocations[i])
+                }
+                for i, symbol in enumerate(self.symbols)
+            }
+        return self._portfolio_view
+
+    def __getitem__(self, key):
+        if key == "total_value":
+            return self.total_value
+        if key == "portfolio":
+            return self.portfolio
+        if key == "timestamp":
+            return self.timestamp
+        raise KeyError(key)
+
+    def as_dict(self) -> Dict[str, any]:
+        """Plain-dict form for JSON serialization and logging"""
+        return {
+            "total_value": self.total_value,
+            "portfolio": self.portfolio,
+            "timestamp": self.timestamp
+        }
 
 class BasicTradingAgent:
     """Basic trading agent with portfolio rebalancing capabilities"""
     
     def __init__(self, portfolio_config_path: str = "config/portfolio_config.json"):
-        self.recall_client = RecallClient()
-        self.market_data = MarketDataProvider()
+        self.recall_client = get_recall_client()
+        self.market_data = get_market_provider()
         self.portfolio_config_path = portfolio_config_path
-        
+
+        # Cached target allocation, invalidated when the config file changes
+        self._alloc_cache: Optional[Dict[str, float]] = None
+        self._alloc_mtime = 0
+
+        # Shared executor for overlapping independent API calls
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
         # Initialize logging
         logger.add("logs/trading_agent.log", rotation="1 day", retention="30 days")
         
@@ -27,111 +110,135 @@ class BasicTradingAgent:
             raise ConnectionError("Cannot connect to Recall Network API")
         
         logger.info("Basic Trading Agent initialized successfully")
-    
+
+    @cached_property
+    def usdc_address(self) -> str:
+        """USDC token address; USDC is the quote side of every trade"""
+        return get_token_address("USDC")
+
+
     def load_target_allocation(self) -> Dict[str, float]:
         """Load target portfolio allocation from config file"""
         try:
-            with open(self.portfolio_config_path, 'r') as f:
-                allocation = json.load(f)
-            
-            # Validate allocation sums to 1.0
-            total = sum(allocation.values())
-            if abs(total - 1.0) > 0.001:
-                logger.warning(f"Portfolio allocation sums to {total}, normalizing...")
-                allocation = {k: v/total for k, v in allocation.items()}
-            
-            logger.info(f"Loaded target allocation: {allocation}")
+            # Re-read only when the file changed on disk; the allocation is
+            # requested on every rebalance and monitoring tick
+            try:
+                mtime = os.stat(self.portfolio_config_path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = -1
+
+            if self._alloc_cache is not None and mtime == self._alloc_mtime:
+                return self._alloc_cache
+
+            if mtime == -1:
+                logger.warning(f"Portfolio config not found at {self.portfolio_config_path}, using default")
+                allocation = {"USDC": 0.4, "WETH": 0.4, "WBTC": 0.2}
+            else:
+                with open(self.portfolio_config_path, 'rb') as f:
+                    allocation = json_utils.loads(f.read())
+
+                # Validate allocation sums to 1.0
+                total = sum(allocation.values())
+                if abs(total - 1.0) > 0.001:
+                    logger.warning(f"Portfolio allocation sums to {total}, normalizing...")
+                    allocation = {k: v/total for k, v in allocation.items()}
+
+                logger.info(f"Loaded target allocation: {allocation}")
+
+            self._alloc_cache = allocation
+            self._alloc_mtime = mtime
             return allocation
-            
-        except FileNotFoundError:
-            logger.warning(f"Portfolio config not found at {self.portfolio_config_path}, using default")
-            return {"USDC": 0.4, "WETH": 0.4, "WBTC": 0.2}
+
         except Exception as e:
             logger.error(f"Error loading portfolio config: {e}")
             raise
     
-    def get_portfolio_status(self) -> Dict[str, any]:
+    def get_portfolio_status(self) -> PortfolioSnapshot:
         """Get current portfolio status including balances and values"""
         try:
-            # Get current balances
-            balances = self.recall_client.get_balances()
-            
-            # Get current prices
+            # Fetch balances and prices concurrently: prices are requested
+            # for every configured token, so neither call waits on the other
+            balances_future = self._executor.submit(self.recall_client.get_balances)
+            prices_future = self._executor.submit(
+                self.market_data.get_prices, list(TOKEN_CONFIG))
+            balances = balances_future.result()
+            prices = prices_future.result()
             symbols = list(balances.keys())
-            prices = self.market_data.get_prices(symbols)
-            
-            # Calculate portfolio value and allocations
-            total_value = 0
-            portfolio = {}
-            
-            for symbol, balance in balances.items():
-                price = prices.get(symbol, 0)
-                value = balance * price
-                total_value += value
-                
-                portfolio[symbol] = {
-                    "balance": balance,
-                    "price": price,
-                    "value": value,
-                    "allocation": 0  # Will be calculated below
-                }
-            
-            # Calculate current allocations
-            if total_value > 0:
-                for symbol in portfolio:
-                    portfolio[symbol]["allocation"] = portfolio[symbol]["value"] / total_value
-            
-            return {
-                "total_value": total_value,
-                "portfolio": portfolio,
-                "timestamp": time.time()
-            }
-            
+
+            # Calculate portfolio value and allocations on aligned arrays
+            n = len(symbols)
+            balance_arr = np.fromiter((balances[s] for s in symbols),
+                                      dtype=np.float64, count=n)
+            price_arr = np.fromiter((prices.get(s, 0.0) for s in symbols),
+                                    dtype=np.float64, count=n)
+            values = balance_arr * price_arr
+            total_value = float(values.sum())
+            allocations = np.divide(values, total_value,
+                                    out=np.zeros_like(values), where=total_value > 0)
+
+            return PortfolioSnapshot(
+                symbols=symbols,
+                balances=balance_arr,
+                prices=price_arr,
+                values=values,
+                allocations=allocations,
+                total_value=total_value,
+                timestamp=time.time()
+            )
+
         except Exception as e:
             logger.error(f"Error getting portfolio status: {e}")
             raise
     
-    def calculate_rebalancing_trades(self, target_allocation: Dict[str, float]) -> List[Dict[str, any]]:
-        """Calculate trades needed to rebalance portfolio"""
+    def calculate_rebalancing_trades(self, target_allocation: Dict[str, float],
+                                     portfolio_status: Optional[PortfolioSnapshot] = None) -> List[Dict[str, any]]:
+        """Calculate trades needed to rebalance portfolio
+
+        An already-fetched portfolio_status can be passed in to avoid a
+        second balances/prices round-trip within the same cycle.
+        """
         try:
-            portfolio_status = self.get_portfolio_status()
-            total_value = portfolio_status["total_value"]
-            current_portfolio = portfolio_status["portfolio"]
-            
+            if portfolio_status is None:
+                portfolio_status = self.get_portfolio_status()
+            total_value = portfolio_status.total_value
+
             if total_value == 0:
                 logger.warning("Portfolio has zero value, cannot rebalance")
                 return []
-            
-            trades = []
-            
-            # Calculate required trades
-            for symbol, target_weight in target_allocation.items():
-                current_value = current_portfolio.get(symbol, {}).get("value", 0)
-                current_weight = current_value / total_value if total_value > 0 else 0
-                target_value = total_value * target_weight
-                
-                weight_diff = current_weight - target_weight
-                value_diff = abs(current_value - target_value)
-                
-                # Check if rebalancing is needed
-                if abs(weight_diff) >= config.rebalance_threshold:
-                    price = current_portfolio.get(symbol, {}).get("price", 0)
-                    if price > 0:
-                        amount = value_diff / price
-                        side = "sell" if weight_diff > 0 else "buy"
-                        
-                        trades.append({
-                            "symbol": symbol,
-                            "side": side,
-                            "amount": amount,
-                            "current_weight": current_weight,
-                            "target_weight": target_weight,
-                            "weight_diff": weight_diff
-                        })
-            
-            # Sort trades: sells first, then buys
-            trades.sort(key=lambda x: 0 if x["side"] == "sell" else 1)
-            
+
+            # Gather the snapshot arrays into target-allocation order
+            symbols = list(target_allocation)
+            n = len(symbols)
+            index = portfolio_status.index
+            target_weights = np.fromiter((target_allocation[s] for s in symbols),
+                                         dtype=np.float64, count=n)
+            values = np.fromiter(
+                (portfolio_status.values[index[s]] if s in index else 0.0 for s in symbols),
+                dtype=np.float64, count=n)
+            prices = np.fromiter(
+                (portfolio_status.prices[index[s]] if s in index else 0.0 for s in symbols),
+                dtype=np.float64, count=n)
+
+            # Rebalance only where drift exceeds threshold and a price is known
+            current_weights, weight_diffs, mask, amounts = _rebalance_kernel(
+                values, target_weights, prices, float(total_value), config.rebalance_threshold
+            )
+            indices = np.nonzero(mask)[0]
+
+            # Order sells (positive drift) before buys
+            indices = indices[np.argsort(weight_diffs[indices] <= 0, kind="stable")]
+            trades = [
+                {
+                    "symbol": symbols[i],
+                    "side": "sell" if weight_diffs[i] > 0 else "buy",
+                    "amount": float(amounts[i] / prices[i]),
+                    "current_weight": float(current_weights[i]),
+                    "target_weight": float(target_weights[i]),
+                    "weight_diff": float(weight_diffs[i])
+                }
+                for i in indices
+            ]
+
             logger.info(f"Calculated {len(trades)} rebalancing trades")
             return trades
             
@@ -144,10 +251,10 @@ class BasicTradingAgent:
         try:
             if side == "sell":
                 from_token = get_token_address(symbol)
-                to_token = get_token_address("USDC")
+                to_token = self.usdc_address
                 trade_amount = self.recall_client.to_base_units(amount, symbol)
             else:  # buy
-                from_token = get_token_address("USDC")
+                from_token = self.usdc_address
                 to_token = get_token_address(symbol)
                 # For buys, amount is in USDC
                 trade_amount = self.recall_client.to_base_units(amount, "USDC")
@@ -189,21 +296,24 @@ class BasicTradingAgent:
                 logger.info("Portfolio is already balanced within threshold")
                 return True
             
-            # Execute trades
-            successful_trades = 0
-            for trade in trades:
-                success = self.execute_trade(
+            # Execute sells concurrently, then buys, so USDC from the sells
+            # is available before it is spent; the client's rate limiter
+            # paces submissions instead of a fixed per-trade sleep
+            def _execute(trade):
+                return self.execute_trade(
                     symbol=trade["symbol"],
                     side=trade["side"],
                     amount=trade["amount"],
                     reason=f"Rebalancing: {trade['current_weight']:.3f} -> {trade['target_weight']:.3f}"
                 )
-                
-                if success:
-                    successful_trades += 1
-                
-                # Small delay between trades
-                time.sleep(1)
+
+            sells = [t for t in trades if t["side"] == "sell"]
+            buys = [t for t in trades if t["side"] == "buy"]
+
+            successful_trades = 0
+            for group in (sells, buys):
+                if group:
+                    successful_trades += sum(self._executor.map(_execute, group))
             
             logger.info(f"Rebalancing complete: {successful_trades}/{len(trades)} trades successful")
             return successful_trades == len(trades)
@@ -219,11 +329,12 @@ class BasicTradingAgent:
             
             # Get portfolio status
             status = self.get_portfolio_status()
-            logger.info(f"Portfolio value: ${status['total_value']:.2f}")
-            
-            # Log current allocations
-            for symbol, data in status["portfolio"].items():
-                logger.info(f"{symbol}: {data['allocation']:.3f} (${data['value']:.2f})")
+            logger.info("Portfolio value: ${:.2f}", status.total_value)
+
+            # Log current allocations in one record, formatted only if emitted
+            logger.opt(lazy=True).info("Allocations: {alloc}", alloc=lambda: ", ".join(
+                f"{sym} {d['allocation']:.3f} (${d['value']:.2f})"
+                for sym, d in status.portfolio.items()))
             
             # Rebalance if needed
             self.rebalance_portfolio()
@@ -233,14 +344,13 @@ class BasicTradingAgent:
         except Exception as e:
             logger.error(f"Error in trading cycle: {e}")
 
-    def get_agent_info(self) -> Dict[str, any]:
+    def get_agent_info(self) -> AgentProfile:
         """Get agent profile and basic information"""
         try:
-            profile = self.recall_client.get_agent_profile()
-            return profile
+            return self.recall_client.get_agent_profile()
         except Exception as e:
             logger.error(f"Error getting agent info: {e}")
-            return {}
+            return AgentProfile()
 
 if __name__ == "__main__":
     # Create basic portfolio config if it doesn't exist
@@ -254,8 +364,8 @@ if __name__ == "__main__":
             "WETH": 0.4,
             "WBTC": 0.2
         }
-        with open(config_path, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        with open(config_path, 'wb') as f:
+            f.write(json_utils.dumps(default_config, indent=True))
         print(f"Created default portfolio config at {config_path}")
 
     # Run the agent
@@ -263,10 +373,9 @@ if __name__ == "__main__":
 
     # Show agent info
     info = agent.get_agent_info()
-    if info.get("success"):
-        agent_data = info.get("agent", {})
-        print(f"Agent: {agent_data.get('name', 'Unknown')}")
-        print(f"Status: {agent_data.get('status', 'Unknown')}")
-        print(f"Verified: {agent_data.get('isVerified', False)}")
+    if info.success:
+        print(f"Agent: {info.name}")
+        print(f"Status: {info.status}")
+        print(f"Verified: {info.is_verified}")
 
     agent.run_single_cycle()
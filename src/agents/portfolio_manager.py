@@ -1,21 +1,15 @@
 """
 Advanced Portfolio Manager with AI Integration and Scheduling
 """
-import json
+import heapq
 import time
-import schedule
-from typing import Dict, List, Optional
+import numpy as np
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 from loguru import logger
 
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    logger.warning("OpenAI not available, AI features disabled")
-
 from .basic_agent import BasicTradingAgent
+from ..utils import json_utils
 from ..utils.config import config
 
 class AdvancedPortfolioManager(BasicTradingAgent):
@@ -24,12 +18,21 @@ class AdvancedPortfolioManager(BasicTradingAgent):
     def __init__(self, portfolio_config_path: str = "config/portfolio_config.json"):
         super().__init__(portfolio_config_path)
         
-        # Initialize OpenAI client if available
+        # Import openai lazily: it drags in httpx/pydantic and is only
+        # needed when an API key is configured
         self.openai_client = None
-        if OPENAI_AVAILABLE and config.openai_api_key:
-            self.openai_client = openai.OpenAI(api_key=config.openai_api_key)
-            logger.info("OpenAI client initialized for AI features")
+        if config.openai_api_key:
+            try:
+                import openai
+                self.openai_client = openai.OpenAI(api_key=config.openai_api_key)
+                logger.info("OpenAI client initialized for AI features")
+            except ImportError:
+                logger.warning("OpenAI not available, AI features disabled")
         
+        # Cache AI market analysis per hour bucket; repeated calls within
+        # the hour reuse the result instead of re-hitting the API
+        self._ai_analysis_cache = (None, None)
+
         # Scheduling setup
         self.setup_scheduler()
         
@@ -37,17 +40,41 @@ class AdvancedPortfolioManager(BasicTradingAgent):
     
     def setup_scheduler(self):
         """Setup automated scheduling for portfolio management"""
+        # Min-heap of (next_run_ts, seq, interval_seconds, callback); the
+        # run loop sleeps until the earliest job is due instead of polling
+        self._jobs: List[tuple] = []
+        self._job_seq = 0
+
         # Daily rebalancing
-        schedule.every().day.at(config.rebalance_time).do(self.scheduled_rebalance)
-        
+        self._add_job(self.scheduled_rebalance, interval=86400, at_time=config.rebalance_time)
+
         # Weekly AI strategy review (if enabled)
         if self.openai_client:
-            schedule.every().monday.at("08:00").do(self.ai_strategy_review)
-        
+            self._add_job(self.ai_strategy_review, interval=7 * 86400,
+                          at_time="08:00", weekday=0)
+
         # Hourly portfolio monitoring
-        schedule.every().hour.do(self.monitor_portfolio)
-        
+        self._add_job(self.monitor_portfolio, interval=3600)
+
         logger.info(f"Scheduler configured - rebalancing at {config.rebalance_time} daily")
+
+    def _add_job(self, callback: Callable, interval: float,
+                 at_time: Optional[str] = None, weekday: Optional[int] = None):
+        """Schedule callback every interval seconds, optionally aligned to HH:MM (and weekday)"""
+        now = datetime.now()
+        if at_time is not None:
+            hour, minute = map(int, at_time.split(":"))
+            next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if weekday is not None:
+                next_run += timedelta(days=(weekday - next_run.weekday()) % 7)
+            while next_run <= now:
+                next_run += timedelta(seconds=interval)
+            next_ts = next_run.timestamp()
+        else:
+            next_ts = time.time() + interval
+
+        heapq.heappush(self._jobs, (next_ts, self._job_seq, interval, callback))
+        self._job_seq += 1
     
     def ai_analyze_market_conditions(self) -> Dict[str, any]:
         """Use AI to analyze current market conditions"""
@@ -55,24 +82,35 @@ class AdvancedPortfolioManager(BasicTradingAgent):
             return {"analysis": "AI analysis not available", "confidence": 0}
         
         try:
+            hour_bucket = int(time.time() // 3600)
+            cached_bucket, cached_analysis = self._ai_analysis_cache
+            if cached_bucket == hour_bucket:
+                return cached_analysis
+
             # Get current portfolio status
             portfolio_status = self.get_portfolio_status()
-            
-            # Get market data for analysis
-            symbols = list(portfolio_status["portfolio"].keys())
-            market_data = {}
-            for symbol in symbols:
-                market_data[symbol] = self.market_data.get_market_data(symbol)
+
+            # Get market data for analysis in a single batched request,
+            # trimmed to the fields the model actually uses
+            symbols = portfolio_status.symbols
+            market_data = {
+                symbol: {k: data.get(k) for k in (
+                    "price", "market_cap", "volume_24h",
+                    "price_change_24h", "price_change_7d", "price_change_30d"
+                )}
+                for symbol, data in self.market_data.get_market_data_batch(symbols).items()
+            }
             
             # Prepare prompt for AI analysis
             prompt = f"""
             Analyze the current cryptocurrency market conditions and provide insights for portfolio management.
             
             Current Portfolio:
-            {json.dumps(portfolio_status, indent=2)}
-            
+            {json_utils.llm_dumps({"total_value": portfolio_status.total_value,
+                                   "portfolio": portfolio_status.portfolio})}
+
             Market Data:
-            {json.dumps(market_data, indent=2)}
+            {json_utils.llm_dumps(market_data)}
             
             Please provide:
             1. Market sentiment analysis
@@ -86,17 +124,19 @@ class AdvancedPortfolioManager(BasicTradingAgent):
             response = self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.3
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
-            
+
             analysis_text = response.choices[0].message.content
-            
-            # Try to parse JSON response
+
+            # JSON mode guarantees a bare JSON object, no fence stripping needed
             try:
-                analysis = json.loads(analysis_text.strip("```json\n").strip("```"))
+                analysis = json_utils.loads(analysis_text)
                 logger.info("AI market analysis completed")
+                self._ai_analysis_cache = (hour_bucket, analysis)
                 return analysis
-            except json.JSONDecodeError:
+            except json_utils.JSONDecodeError:
                 logger.warning("AI response was not valid JSON")
                 return {
                     "analysis": analysis_text,
@@ -121,10 +161,10 @@ class AdvancedPortfolioManager(BasicTradingAgent):
             Based on current market conditions and analysis, suggest an optimal portfolio allocation.
             
             Current Allocation:
-            {json.dumps(current_allocation, indent=2)}
-            
+            {json_utils.llm_dumps(current_allocation)}
+
             Market Analysis:
-            {json.dumps(market_analysis, indent=2)}
+            {json_utils.llm_dumps(market_analysis)}
             
             Available tokens: USDC, WETH, WBTC
             
@@ -141,33 +181,30 @@ class AdvancedPortfolioManager(BasicTradingAgent):
             response = self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.2
+                temperature=0.2,
+                response_format={"type": "json_object"}
             )
+
+            suggested_allocation = json_utils.loads(response.choices[0].message.content)
             
-            suggestion_text = response.choices[0].message.content.strip()
-            
-            # Clean and parse JSON
-            suggestion_text = suggestion_text.strip("```json\n").strip("```").strip()
-            suggested_allocation = json.loads(suggestion_text)
-            
-            # Validate allocation
-            total = sum(suggested_allocation.values())
+            # Normalize, clamp to the per-token bounds and renormalize in
+            # one vectorized pass
+            keys = list(suggested_allocation)
+            vals = np.fromiter((suggested_allocation[k] for k in keys),
+                               dtype=np.float64, count=len(keys))
+            total = vals.sum()
             if abs(total - 1.0) > 0.01:
                 logger.warning(f"AI suggested allocation sums to {total}, normalizing...")
-                suggested_allocation = {k: v/total for k, v in suggested_allocation.items()}
-            
-            # Check constraints
-            for symbol, allocation in suggested_allocation.items():
-                if allocation < 0.05:
-                    logger.warning(f"AI suggested {allocation:.3f} for {symbol}, adjusting to minimum 0.05")
-                    suggested_allocation[symbol] = 0.05
-                elif allocation > 0.70:
-                    logger.warning(f"AI suggested {allocation:.3f} for {symbol}, adjusting to maximum 0.70")
-                    suggested_allocation[symbol] = 0.70
-            
-            # Renormalize after constraint adjustments
-            total = sum(suggested_allocation.values())
-            suggested_allocation = {k: v/total for k, v in suggested_allocation.items()}
+            vals /= total
+
+            clamped = np.clip(vals, 0.05, 0.70)
+            adjusted = np.nonzero(clamped != vals)[0]
+            if adjusted.size:
+                logger.warning("Clamped AI allocation to [0.05, 0.70] for: {}",
+                               ", ".join(keys[i] for i in adjusted))
+
+            clamped /= clamped.sum()
+            suggested_allocation = dict(zip(keys, clamped.tolist()))
             
             logger.info(f"AI suggested allocation: {suggested_allocation}")
             return suggested_allocation
@@ -196,8 +233,8 @@ class AdvancedPortfolioManager(BasicTradingAgent):
                 logger.info(f"AI suggests significant allocation change (max: {max_change:.3f})")
                 
                 # Save new allocation
-                with open(self.portfolio_config_path, 'w') as f:
-                    json.dump(suggested_allocation, f, indent=2)
+                with open(self.portfolio_config_path, 'wb') as f:
+                    f.write(json_utils.dumps(suggested_allocation, indent=True))
                 
                 logger.info("Portfolio allocation updated based on AI recommendation")
                 
@@ -216,11 +253,12 @@ class AdvancedPortfolioManager(BasicTradingAgent):
             
             # Check for significant value changes
             # This could be enhanced with historical tracking
-            logger.info(f"Portfolio monitoring - Total value: ${status['total_value']:.2f}")
+            logger.info("Portfolio monitoring - Total value: ${:.2f}", status.total_value)
             
-            # Check if emergency rebalancing is needed (large drift)
+            # Check if emergency rebalancing is needed (large drift),
+            # reusing the status fetched above
             target_allocation = self.load_target_allocation()
-            trades = self.calculate_rebalancing_trades(target_allocation)
+            trades = self.calculate_rebalancing_trades(target_allocation, portfolio_status=status)
             
             # If large drift detected, trigger emergency rebalancing
             large_drift_trades = [t for t in trades if abs(t["weight_diff"]) > config.rebalance_threshold * 2]
@@ -244,12 +282,17 @@ class AdvancedPortfolioManager(BasicTradingAgent):
         try:
             # Run initial cycle
             self.run_single_cycle()
-            
-            # Start scheduled operations
+
+            # Sleep until the next job is due, run it, and requeue it
             while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-                
+                next_ts, seq, interval, callback = heapq.heappop(self._jobs)
+                delay = next_ts - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                callback()
+                heapq.heappush(self._jobs, (next_ts + interval, seq, interval, callback))
+
+
         except KeyboardInterrupt:
             logger.info("Portfolio manager stopped by user")
         except Exception as e:
@@ -1,12 +1,41 @@
 """
 Market data provider for cryptocurrency prices and market information
 """
+import functools
+import os
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional
 from loguru import logger
 
-from ..utils.config import config, TOKEN_CONFIG
+from ..utils import json_utils
+from ..utils.config import config, CG_ID_TO_SYMBOL, SYMBOL_TO_CG_ID, TOKEN_CONFIG
+from ..utils.rate_limiter import RateLimiter
+from ..utils.ttl_cache import PersistentTTLCache
+
+# Cache TTLs (seconds) aligned to how often each endpoint's data
+# actually changes; tunable via environment
+CACHE_TTL_PRICE = int(os.getenv("CACHE_TTL_PRICE", "60"))
+CACHE_TTL_MARKET = int(os.getenv("CACHE_TTL_MARKET", "300"))
+CACHE_TTL_TRENDING = int(os.getenv("CACHE_TTL_TRENDING", "600"))
+
+# Cache files survive restarts so a cron-driven redeploy warm-starts
+# instead of burning the rate budget on a cold fetch round
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+
+class _PendingPriceBatch:
+    """Single-symbol price requests gathered into one /simple/price call"""
+
+    __slots__ = ("symbols", "event", "prices")
+
+    def __init__(self):
+        self.symbols = set()
+        self.event = threading.Event()
+        self.prices: Dict[str, float] = {}
 
 class MarketDataProvider:
     """Provides real-time market data from multiple sources"""
@@ -14,31 +43,77 @@ class MarketDataProvider:
     def __init__(self):
         self.coingecko_base = "https://api.coingecko.com/api/v3"
         self.session = requests.Session()
+
+        # Keep-alive pool sized for the concurrent fetch paths, with
+        # backoff-and-retry on transient CoinGecko errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset(["GET"])
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Token bucket sized to the CoinGecko tier: ~30/min free, higher
+        # with an API key. Replaces fixed per-call sleeps
+        self.rate_limiter = RateLimiter(
+            rate=490 if config.coingecko_api_key else 29, period=60.0)
+
+        # Response caches keyed per endpoint; hits skip the network
+        # entirely and persist to disk across process restarts
+        self._price_cache = PersistentTTLCache(
+            os.path.join(CACHE_DIR, "prices.json"),
+            maxsize=512, ttl=CACHE_TTL_PRICE)
+        self._market_cache = PersistentTTLCache(
+            os.path.join(CACHE_DIR, "market_data.json"),
+            maxsize=256, ttl=CACHE_TTL_MARKET)
+        self._trending_cache = PersistentTTLCache(
+            os.path.join(CACHE_DIR, "trending.json"),
+            maxsize=8, ttl=CACHE_TTL_TRENDING)
         
         # Add API key if available
         if config.coingecko_api_key:
             self.session.headers.update({
                 "x-cg-demo-api-key": config.coingecko_api_key
             })
+
+        # Shared executor for concurrent fetches; the worker bound keeps
+        # in-flight requests under CoinGecko's per-host connection cap
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Coalescing window for single-symbol price lookups: concurrent
+        # get_price callers within the window share one batched request
+        self._coalesce_lock = threading.Lock()
+        self._coalesce_window = float(os.getenv("PRICE_COALESCE_WINDOW", "0.05"))
+        self._pending_prices: Optional[_PendingPriceBatch] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8)
+        return self._executor
     
     def get_prices(self, symbols: List[str]) -> Dict[str, float]:
         """Get current prices for multiple tokens"""
         try:
             # Map symbols to CoinGecko IDs
-            coingecko_ids = []
-            symbol_to_id = {}
-            
-            for symbol in symbols:
-                if symbol in TOKEN_CONFIG:
-                    cg_id = TOKEN_CONFIG[symbol]["coingecko_id"]
-                    coingecko_ids.append(cg_id)
-                    symbol_to_id[cg_id] = symbol
-            
+            coingecko_ids = [SYMBOL_TO_CG_ID[s] for s in symbols if s in SYMBOL_TO_CG_ID]
+
             if not coingecko_ids:
                 return {}
-            
+
+            cache_key = tuple(sorted(coingecko_ids))
+            cached = self._price_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             # Fetch prices from CoinGecko
             ids_str = ",".join(coingecko_ids)
+            self.rate_limiter.acquire()
             response = self.session.get(
                 f"{self.coingecko_base}/simple/price",
                 params={
@@ -49,15 +124,20 @@ class MarketDataProvider:
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = json_utils.loads(response.content)
             
             # Convert back to symbol-based mapping
             prices = {}
             for cg_id, price_data in data.items():
-                symbol = symbol_to_id.get(cg_id)
+                symbol = CG_ID_TO_SYMBOL.get(cg_id)
                 if symbol and "usd" in price_data:
                     prices[symbol] = float(price_data["usd"])
             
+            # Also cache per symbol so later single-symbol lookups hit;
+            # one set_many keeps this to a single disk flush
+            entries = {(SYMBOL_TO_CG_ID[s],): {s: p} for s, p in prices.items()}
+            entries[cache_key] = prices
+            self._price_cache.set_many(entries)
             logger.info(f"Fetched prices for {len(prices)} tokens")
             return prices
             
@@ -66,18 +146,51 @@ class MarketDataProvider:
             return {}
     
     def get_price(self, symbol: str) -> Optional[float]:
-        """Get current price for a single token"""
-        prices = self.get_prices([symbol])
-        return prices.get(symbol)
+        """Get current price for a single token
+
+        Cache misses wait out a short window so concurrent callers (e.g.
+        per-token slippage checks fanned out by the executor) are merged
+        into a single /simple/price request.
+        """
+        cg_id = SYMBOL_TO_CG_ID.get(symbol)
+        if cg_id is None:
+            return None
+        cached = self._price_cache.get((cg_id,))
+        if cached is not None:
+            return cached.get(symbol)
+
+        with self._coalesce_lock:
+            batch = self._pending_prices
+            leader = batch is None
+            if leader:
+                batch = self._pending_prices = _PendingPriceBatch()
+            batch.symbols.add(symbol)
+
+        if leader:
+            # First caller collects stragglers, then fetches for everyone
+            time.sleep(self._coalesce_window)
+            with self._coalesce_lock:
+                self._pending_prices = None
+            batch.prices = self.get_prices(list(batch.symbols))
+            batch.event.set()
+        else:
+            batch.event.wait(timeout=30)
+
+        return batch.prices.get(symbol)
     
     def get_market_data(self, symbol: str) -> Dict[str, any]:
         """Get detailed market data for a token"""
         try:
             if symbol not in TOKEN_CONFIG:
                 raise ValueError(f"Unknown token symbol: {symbol}")
-            
-            cg_id = TOKEN_CONFIG[symbol]["coingecko_id"]
-            
+
+            cached = self._market_cache.get(symbol)
+            if cached is not None:
+                return cached
+
+            cg_id = SYMBOL_TO_CG_ID[symbol]
+
+            self.rate_limiter.acquire()
             response = self.session.get(
                 f"{self.coingecko_base}/coins/{cg_id}",
                 params={
@@ -92,10 +205,10 @@ class MarketDataProvider:
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = json_utils.loads(response.content)
             market_data = data.get("market_data", {})
-            
-            return {
+
+            result = {
                 "symbol": symbol,
                 "price": market_data.get("current_price", {}).get("usd", 0),
                 "market_cap": market_data.get("market_cap", {}).get("usd", 0),
@@ -107,26 +220,121 @@ class MarketDataProvider:
                 "low_24h": market_data.get("low_24h", {}).get("usd", 0),
                 "circulating_supply": market_data.get("circulating_supply", 0),
                 "total_supply": market_data.get("total_supply", 0),
-                "last_updated": market_data.get("last_updated")
+                "last_updated": market_data.get("last_updated"),
+                "fetched_at": time.time()
             }
-            
+
+            self._market_cache.set(symbol, result)
+            return result
+
         except Exception as e:
             logger.error(f"Failed to fetch market data for {symbol}: {e}")
             return {}
     
+    def get_market_data_parallel(self, symbols: List[str]) -> Dict[str, Dict[str, any]]:
+        """Fetch detailed market data for multiple tokens concurrently
+
+        Issues the per-token requests in parallel over the pooled session,
+        so wall time is the slowest round-trip instead of their sum.
+        """
+        market_data = {}
+        executor = self._get_executor()
+        futures = {executor.submit(self.get_market_data, s): s for s in symbols}
+        for future in as_completed(futures):
+            data = future.result()
+            if data:
+                market_data[futures[future]] = data
+        return market_data
+
+    def get_market_data_batch(self, symbols: List[str]) -> Dict[str, Dict[str, any]]:
+        """Get detailed market data for multiple tokens in one request"""
+        try:
+            # Serve cached symbols and only fetch the rest
+            market_data = {}
+            missing = []
+            for s in symbols:
+                cached = self._market_cache.get(s)
+                if cached is not None:
+                    market_data[s] = cached
+                else:
+                    missing.append(s)
+
+            id_to_symbol = {
+                SYMBOL_TO_CG_ID[s]: s
+                for s in missing if s in SYMBOL_TO_CG_ID
+            }
+            if not id_to_symbol:
+                return market_data
+
+            self.rate_limiter.acquire()
+            response = self.session.get(
+                f"{self.coingecko_base}/coins/markets",
+                params={
+                    "vs_currency": "usd",
+                    "ids": ",".join(id_to_symbol),
+                    "price_change_percentage": "24h,7d,30d",
+                    "sparkline": "false"
+                },
+                timeout=15
+            )
+            response.raise_for_status()
+
+            fetched = {}
+            for entry in json_utils.loads(response.content):
+                symbol = id_to_symbol.get(entry.get("id"))
+                if not symbol:
+                    continue
+                fetched[symbol] = {
+                    "symbol": symbol,
+                    "price": entry.get("current_price", 0),
+                    "market_cap": entry.get("market_cap", 0),
+                    "volume_24h": entry.get("total_volume", 0),
+                    "price_change_24h": entry.get("price_change_percentage_24h_in_currency", 0),
+                    "price_change_7d": entry.get("price_change_percentage_7d_in_currency", 0),
+                    "price_change_30d": entry.get("price_change_percentage_30d_in_currency", 0),
+                    "high_24h": entry.get("high_24h", 0),
+                    "low_24h": entry.get("low_24h", 0),
+                    "circulating_supply": entry.get("circulating_supply", 0),
+                    "total_supply": entry.get("total_supply", 0),
+                    "last_updated": entry.get("last_updated"),
+                    "fetched_at": time.time()
+                }
+            self._market_cache.set_many(fetched)
+            market_data.update(fetched)
+
+            # Fall back to per-coin requests only for symbols the bulk
+            # response did not include
+            for symbol in id_to_symbol.values():
+                if symbol not in market_data:
+                    data = self.get_market_data(symbol)
+                    if data:
+                        market_data[symbol] = data
+
+            logger.info(f"Fetched market data for {len(id_to_symbol)} tokens in one request")
+            return market_data
+
+        except Exception as e:
+            logger.error(f"Failed to fetch batched market data: {e}")
+            return {}
+
     def get_trending_tokens(self, limit: int = 10) -> List[Dict[str, any]]:
         """Get trending tokens from CoinGecko"""
         try:
+            cached = self._trending_cache.get(limit)
+            if cached is not None:
+                return cached
+
+            self.rate_limiter.acquire()
             response = self.session.get(
                 f"{self.coingecko_base}/search/trending",
                 timeout=10
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = json_utils.loads(response.content)
             trending = data.get("coins", [])[:limit]
-            
-            return [
+
+            result = [
                 {
                     "symbol": coin["item"]["symbol"],
                     "name": coin["item"]["name"],
@@ -135,16 +343,31 @@ class MarketDataProvider:
                 }
                 for coin in trending
             ]
+            self._trending_cache.set(limit, result)
+            return result
             
         except Exception as e:
             logger.error(f"Failed to fetch trending tokens: {e}")
             return []
     
     def wait_for_rate_limit(self):
-        """Wait to respect rate limits"""
-        if not config.coingecko_api_key:
-            # Free tier: 30 calls/minute
-            time.sleep(2)
-        else:
-            # Pro tier: higher limits
-            time.sleep(0.1)
+        """Wait only if the rate budget is exhausted"""
+        self.rate_limiter.acquire()
+
+    def clear_caches(self):
+        """Drop all cached responses, in memory and on disk"""
+        self._price_cache.clear()
+        self._market_cache.clear()
+        self._trending_cache.clear()
+
+    def close(self):
+        """Release the pooled session and worker threads"""
+        self.session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+@functools.lru_cache(maxsize=1)
+def get_market_provider() -> MarketDataProvider:
+    """Shared provider instance so every caller reuses one warm session"""
+    return MarketDataProvider()
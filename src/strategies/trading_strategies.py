@@ -2,11 +2,82 @@
 Trading Strategies for Recall Network Agent
 """
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from loguru import logger
 from datetime import datetime, timedelta
 
+from ..utils.config import STABLE_SYMBOLS
+from ..utils.jit import njit
+
+# Compact signal encoding shared by the vectorized paths; on ties the
+# lowest code wins, matching the old dict-vote insertion order
+SIGNAL_CODES = {"buy": 0, "sell": 1, "hold": 2}
+SIGNAL_NAMES = ("buy", "sell", "hold")
+BUY, SELL, HOLD = 0, 1, 2
+
+def _field_array(market_data: Dict[str, any], symbols: List[str], field: str) -> np.ndarray:
+    """Extract one market-data field into an aligned float64 array"""
+    return np.fromiter(
+        (market_data.get(s, {}).get(field) or 0.0 for s in symbols),
+        dtype=np.float64, count=len(symbols))
+
+def _stable_mask(symbols: List[str]) -> np.ndarray:
+    """Boolean mask of stablecoins, which always hold"""
+    return np.fromiter((s in STABLE_SYMBOLS for s in symbols),
+                       dtype=bool, count=len(symbols))
+
+@njit(cache=True, fastmath=True)
+def _tick_kernel(chg24, chg7, chg30, mom_thr, rev_thr, vol_lo, vol_hi, is_stable):
+    """Fused per-tick kernel: three default strategies plus majority vote
+
+    Runs the whole signal pipeline in one pass over the arrays; compiled
+    by numba when available, plain NumPy-on-Python otherwise.
+    """
+    n = chg24.shape[0]
+    combined = np.empty(n, dtype=np.int8)
+    for i in range(n):
+        if is_stable[i]:
+            combined[i] = 2  # hold
+            continue
+
+        buy = sell = hold = 0
+
+        # Momentum on the 7-day change
+        momentum = chg7[i] / 100.0
+        if momentum > mom_thr:
+            buy += 1
+        elif momentum < -mom_thr:
+            sell += 1
+        else:
+            hold += 1
+
+        # Mean reversion on the 30-day change
+        reversion = chg30[i] / 100.0
+        if reversion < -rev_thr:
+            buy += 1
+        elif reversion > rev_thr:
+            sell += 1
+        else:
+            hold += 1
+
+        # Volatility estimate from 24h/7d changes
+        vol = (abs(chg24[i]) * 7.0 + abs(chg7[i])) / 200.0
+        if vol < vol_lo:
+            buy += 1
+        elif vol > vol_hi:
+            sell += 1
+        else:
+            hold += 1
+
+        # Majority vote with ties resolved buy > sell > hold
+        if buy >= sell and buy >= hold:
+            combined[i] = 0
+        elif sell >= hold:
+            combined[i] = 1
+        else:
+            combined[i] = 2
+    return combined
+
 class TradingStrategy:
     """Base class for trading strategies"""
     
@@ -33,26 +104,21 @@ class MomentumStrategy(TradingStrategy):
     
     def generate_signals(self, market_data: Dict[str, any]) -> Dict[str, str]:
         """Generate signals based on price momentum"""
-        signals = {}
-        
-        for symbol, data in market_data.items():
-            if symbol == "USDC":  # Skip stablecoin
-                signals[symbol] = "hold"
-                continue
-            
-            # Use 7-day price change as momentum indicator
-            price_change_7d = data.get("price_change_7d", 0) / 100
-            
-            if price_change_7d > self.momentum_threshold:
-                signals[symbol] = "buy"
-                self.logger.info(f"{symbol}: BUY signal (7d change: {price_change_7d:.2%})")
-            elif price_change_7d < -self.momentum_threshold:
-                signals[symbol] = "sell"
-                self.logger.info(f"{symbol}: SELL signal (7d change: {price_change_7d:.2%})")
-            else:
-                signals[symbol] = "hold"
-        
-        return signals
+        symbols = list(market_data)
+
+        # Use 7-day price change as momentum indicator
+        changes = _field_array(market_data, symbols, "price_change_7d") / 100
+
+        codes = np.select(
+            [changes > self.momentum_threshold, changes < -self.momentum_threshold],
+            [BUY, SELL], default=HOLD)
+        codes[_stable_mask(symbols)] = HOLD  # Skip stablecoin
+
+        for i in np.nonzero(codes != HOLD)[0]:
+            self.logger.debug("{}: {} signal (7d change: {:.2%})",
+                              symbols[i], SIGNAL_NAMES[codes[i]].upper(), changes[i])
+
+        return {s: SIGNAL_NAMES[codes[i]] for i, s in enumerate(symbols)}
     
     def calculate_position_sizes(self, signals: Dict[str, str], 
                                portfolio_value: float) -> Dict[str, float]:
@@ -84,28 +150,22 @@ class MeanReversionStrategy(TradingStrategy):
     
     def generate_signals(self, market_data: Dict[str, any]) -> Dict[str, str]:
         """Generate signals based on mean reversion"""
-        signals = {}
-        
-        for symbol, data in market_data.items():
-            if symbol == "USDC":
-                signals[symbol] = "hold"
-                continue
-            
-            # Use 30-day price change for mean reversion
-            price_change_30d = data.get("price_change_30d", 0) / 100
-            
-            # Buy if significantly down (expecting reversion)
-            if price_change_30d < -self.reversion_threshold:
-                signals[symbol] = "buy"
-                self.logger.info(f"{symbol}: BUY signal (30d change: {price_change_30d:.2%})")
-            # Sell if significantly up (expecting reversion)
-            elif price_change_30d > self.reversion_threshold:
-                signals[symbol] = "sell"
-                self.logger.info(f"{symbol}: SELL signal (30d change: {price_change_30d:.2%})")
-            else:
-                signals[symbol] = "hold"
-        
-        return signals
+        symbols = list(market_data)
+
+        # Use 30-day price change for mean reversion: buy if significantly
+        # down, sell if significantly up (expecting reversion either way)
+        changes = _field_array(market_data, symbols, "price_change_30d") / 100
+
+        codes = np.select(
+            [changes < -self.reversion_threshold, changes > self.reversion_threshold],
+            [BUY, SELL], default=HOLD)
+        codes[_stable_mask(symbols)] = HOLD
+
+        for i in np.nonzero(codes != HOLD)[0]:
+            self.logger.debug("{}: {} signal (30d change: {:.2%})",
+                              symbols[i], SIGNAL_NAMES[codes[i]].upper(), changes[i])
+
+        return {s: SIGNAL_NAMES[codes[i]] for i, s in enumerate(symbols)}
     
     def calculate_position_sizes(self, signals: Dict[str, str], 
                                portfolio_value: float) -> Dict[str, float]:
@@ -131,48 +191,53 @@ class VolatilityStrategy(TradingStrategy):
         super().__init__("Volatility")
         self.vol_threshold_low = vol_threshold_low
         self.vol_threshold_high = vol_threshold_high
-    
+
+        # Memoized volatilities for the last market_data snapshot, so
+        # generate_signals and calculate_volatility on the same tick
+        # compute the array once
+        self._vol_cache_key: Optional[Tuple[int, Tuple[str, ...]]] = None
+        self._vol_cache_val: Optional[np.ndarray] = None
+
+    def _volatility_array(self, market_data: Dict[str, any], symbols: List[str]) -> np.ndarray:
+        """Estimate volatility from recent price changes, per symbol"""
+        key = (id(market_data), tuple(symbols))
+        if key == self._vol_cache_key:
+            return self._vol_cache_val
+
+        change_24h = np.abs(_field_array(market_data, symbols, "price_change_24h"))
+        change_7d = np.abs(_field_array(market_data, symbols, "price_change_7d"))
+
+        # Simple volatility estimate: (|24h|/100 * 7 + |7d|/100) / 2
+        volatilities = (change_24h * 7 + change_7d) / 200
+        volatilities[_stable_mask(symbols)] = 0.0
+
+        self._vol_cache_key = key
+        self._vol_cache_val = volatilities
+        return volatilities
+
     def calculate_volatility(self, market_data: Dict[str, any]) -> Dict[str, float]:
         """Calculate implied volatility from price changes"""
-        volatilities = {}
-        
-        for symbol, data in market_data.items():
-            if symbol == "USDC":
-                volatilities[symbol] = 0.0
-                continue
-            
-            # Estimate volatility from recent price changes
-            price_change_24h = abs(data.get("price_change_24h", 0)) / 100
-            price_change_7d = abs(data.get("price_change_7d", 0)) / 100
-            
-            # Simple volatility estimate
-            volatility = (price_change_24h * 7 + price_change_7d) / 2
-            volatilities[symbol] = volatility
-        
-        return volatilities
-    
+        symbols = list(market_data)
+        return dict(zip(symbols, self._volatility_array(market_data, symbols).tolist()))
+
     def generate_signals(self, market_data: Dict[str, any]) -> Dict[str, str]:
         """Generate signals based on volatility levels"""
-        signals = {}
-        volatilities = self.calculate_volatility(market_data)
-        
-        for symbol, volatility in volatilities.items():
-            if symbol == "USDC":
-                signals[symbol] = "hold"
-                continue
-            
-            if volatility < self.vol_threshold_low:
-                # Low volatility - expect breakout
-                signals[symbol] = "buy"
-                self.logger.info(f"{symbol}: BUY signal (low vol: {volatility:.3f})")
-            elif volatility > self.vol_threshold_high:
-                # High volatility - reduce exposure
-                signals[symbol] = "sell"
-                self.logger.info(f"{symbol}: SELL signal (high vol: {volatility:.3f})")
-            else:
-                signals[symbol] = "hold"
-        
-        return signals
+        symbols = list(market_data)
+        volatilities = self._volatility_array(market_data, symbols)
+
+        # Low volatility: expect breakout; high volatility: reduce exposure
+        codes = np.select(
+            [volatilities < self.vol_threshold_low, volatilities > self.vol_threshold_high],
+            [BUY, SELL], default=HOLD)
+        codes[_stable_mask(symbols)] = HOLD
+
+        for i in np.nonzero(codes != HOLD)[0]:
+            level = "low" if codes[i] == BUY else "high"
+            self.logger.debug("{}: {} signal ({} vol: {:.3f})",
+                              symbols[i], SIGNAL_NAMES[codes[i]].upper(),
+                              level, volatilities[i])
+
+        return {s: SIGNAL_NAMES[codes[i]] for i, s in enumerate(symbols)}
     
     def calculate_position_sizes(self, signals: Dict[str, str], 
                                portfolio_value: float) -> Dict[str, float]:
@@ -221,29 +286,64 @@ class StrategyManager:
             try:
                 signals = strategy.generate_signals(market_data)
                 all_signals[name] = signals
-                self.logger.info(f"Generated signals for {name}: {signals}")
+                self.logger.debug("Generated signals for {}: {}", name, signals)
             except Exception as e:
                 self.logger.error(f"Error generating signals for {name}: {e}")
         
-        # Combine signals using majority voting
-        combined_signals = {}
-        symbols = set()
-        for signals in all_signals.values():
-            symbols.update(signals.keys())
-        
-        for symbol in symbols:
-            votes = {"buy": 0, "sell": 0, "hold": 0}
-            
-            for signals in all_signals.values():
-                signal = signals.get(symbol, "hold")
-                votes[signal] += 1
-            
-            # Choose signal with most votes
-            combined_signals[symbol] = max(votes, key=votes.get)
-        
+        # Combine signals using majority voting on an (M, N) code matrix.
+        # Every strategy signals the same market_data symbols, so a single
+        # order-preserving pass replaces the set union
+        symbols = list(dict.fromkeys(
+            s for signals in all_signals.values() for s in signals))
+
+        m, n = len(all_signals), len(symbols)
+        if m == 0 or n == 0:
+            return {}
+
+        matrix = np.full((m, n), SIGNAL_CODES["hold"], dtype=np.int8)
+        for row, signals in enumerate(all_signals.values()):
+            for col, symbol in enumerate(symbols):
+                signal = signals.get(symbol)
+                if signal is not None:
+                    matrix[row, col] = SIGNAL_CODES[signal]
+
+        counts = np.zeros((len(SIGNAL_NAMES), n), dtype=np.int16)
+        np.add.at(counts, (matrix, np.arange(n)), 1)
+        winners = counts.argmax(axis=0)
+
+        combined_signals = {symbols[j]: SIGNAL_NAMES[winners[j]] for j in range(n)}
+
         self.logger.info(f"Combined signals: {combined_signals}")
         return combined_signals
-    
+
+    def get_combined_signals_fast(self, market_data: Dict[str, any]) -> Dict[str, str]:
+        """Combined signals via the fused kernel for the default strategies
+
+        Falls back to get_combined_signals when custom strategies have
+        been registered, since the kernel hardcodes the default three.
+        """
+        if set(self.strategies) != {"momentum", "mean_reversion", "volatility"}:
+            return self.get_combined_signals(market_data)
+
+        symbols = list(market_data)
+        if not symbols:
+            return {}
+
+        codes = _tick_kernel(
+            _field_array(market_data, symbols, "price_change_24h"),
+            _field_array(market_data, symbols, "price_change_7d"),
+            _field_array(market_data, symbols, "price_change_30d"),
+            self.strategies["momentum"].momentum_threshold,
+            self.strategies["mean_reversion"].reversion_threshold,
+            self.strategies["volatility"].vol_threshold_low,
+            self.strategies["volatility"].vol_threshold_high,
+            _stable_mask(symbols)
+        )
+
+        combined_signals = {s: SIGNAL_NAMES[codes[i]] for i, s in enumerate(symbols)}
+        self.logger.info(f"Combined signals: {combined_signals}")
+        return combined_signals
+
     def get_strategy_allocation(self, strategy_name: str, market_data: Dict[str, any], 
                               portfolio_value: float) -> Dict[str, float]:
         """Get allocation from a specific strategy"""
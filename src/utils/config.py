@@ -2,6 +2,7 @@
 Configuration management for Recall Network Trading Agent
 """
 import os
+import functools
 from typing import Dict, Any
 from dotenv import load_dotenv
 from pydantic import BaseSettings, validator
@@ -97,18 +98,31 @@ TOKEN_CONFIG = {
     }
 }
 
+# Lookup maps derived from TOKEN_CONFIG once at import
+SYMBOL_TO_CG_ID = {sym: cfg["coingecko_id"] for sym, cfg in TOKEN_CONFIG.items()}
+CG_ID_TO_SYMBOL = {cg_id: sym for sym, cg_id in SYMBOL_TO_CG_ID.items()}
+TOKEN_ADDRESS = {sym: cfg["address"] for sym, cfg in TOKEN_CONFIG.items()}
+TOKEN_DECIMALS = {sym: cfg["decimals"] for sym, cfg in TOKEN_CONFIG.items()}
+TOKEN_SCALE = {sym: 10 ** dec for sym, dec in TOKEN_DECIMALS.items()}
+
+# Stablecoins are never traded on signals; strategies always hold them
+STABLE_SYMBOLS = frozenset({"USDC"})
+
 def get_api_url() -> str:
     """Get the appropriate API URL based on environment"""
     return API_URLS[config.environment]
 
+@functools.lru_cache(maxsize=64)
 def get_token_address(symbol: str) -> str:
     """Get token address by symbol"""
-    if symbol not in TOKEN_CONFIG:
-        raise ValueError(f"Unknown token symbol: {symbol}")
-    return TOKEN_CONFIG[symbol]["address"]
+    try:
+        return TOKEN_ADDRESS[symbol]
+    except KeyError:
+        raise ValueError(f"Unknown token symbol: {symbol}") from None
 
 def get_token_decimals(symbol: str) -> int:
     """Get token decimals by symbol"""
-    if symbol not in TOKEN_CONFIG:
-        raise ValueError(f"Unknown token symbol: {symbol}")
-    return TOKEN_CONFIG[symbol]["decimals"]
+    try:
+        return TOKEN_DECIMALS[symbol]
+    except KeyError:
+        raise ValueError(f"Unknown token symbol: {symbol}") from None
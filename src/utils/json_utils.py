@@ -0,0 +1,36 @@
+"""
+JSON helpers backed by orjson for fast parsing and serialization
+"""
+import orjson
+
+# Re-export so callers can catch parse errors without importing orjson
+JSONDecodeError = orjson.JSONDecodeError
+
+def loads(data):
+    """Parse JSON from a str or bytes payload"""
+    return orjson.loads(data)
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize an object to JSON bytes, optionally 2-space indented"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+def dumps_str(obj, indent: bool = False) -> str:
+    """Serialize an object to a JSON string"""
+    return dumps(obj, indent=indent).decode()
+
+def _round_floats(obj, ndigits: int):
+    if isinstance(obj, float):
+        return round(obj, ndigits)
+    if isinstance(obj, dict):
+        return {k: _round_floats(v, ndigits) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_round_floats(v, ndigits) for v in obj]
+    return obj
+
+def llm_dumps(obj, ndigits: int = 4) -> str:
+    """Compact JSON for LLM prompts: rounded floats, no indentation
+
+    Full-precision floats and indentation only inflate the prompt token
+    count; the model needs neither.
+    """
+    return orjson.dumps(_round_floats(obj, ndigits)).decode()
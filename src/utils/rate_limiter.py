@@ -0,0 +1,31 @@
+"""
+Thread-safe token-bucket rate limiter for API calls
+"""
+import threading
+import time
+
+class RateLimiter:
+    """Token bucket that only sleeps when the rate budget is exhausted"""
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request slot is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.rate / self.period
+                self._tokens = min(self.rate, self._tokens + refill)
+                self._updated = now
+
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+
+                wait = (1.0 - self._tokens) * self.period / self.rate
+            time.sleep(wait)
@@ -1,13 +1,35 @@
 """
 Recall Network API Client
 """
+import functools
 import requests
-import time
-from typing import Dict, List, Optional, Any
-from decimal import Decimal, ROUND_DOWN
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, NamedTuple, Optional, Any
 from loguru import logger
 
-from .config import config, get_api_url, get_token_decimals
+from . import json_utils
+from .config import config, get_api_url, get_token_decimals, TOKEN_DECIMALS, TOKEN_SCALE
+from .rate_limiter import RateLimiter
+
+class AgentProfile(NamedTuple):
+    """Typed view of the /api/agent/profile response"""
+    success: bool = False
+    name: str = "Unknown"
+    status: str = "Unknown"
+    is_verified: bool = False
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> "AgentProfile":
+        agent = response.get("agent", {})
+        return cls(
+            success=response.get("success", False),
+            name=agent.get("name", "Unknown"),
+            status=agent.get("status", "Unknown"),
+            is_verified=agent.get("isVerified", False)
+        )
 
 class RecallClient:
     """Client for interacting with Recall Network API"""
@@ -16,29 +38,55 @@ class RecallClient:
         self.base_url = get_api_url()
         self.headers = {
             "Authorization": f"Bearer {config.recall_api_key}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Connection": "keep-alive"
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+
+        # Keep warm connections across the trade loop so consecutive
+        # requests skip the TCP+TLS handshake; retry transient failures
+        # with backoff at the connection layer
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                backoff_jitter=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset(["GET", "POST"])
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Gate trade submissions instead of sleeping a fixed delay per trade
+        self._trade_limiter = RateLimiter(rate=60, period=60.0)
+
+        # Shared executor for fanning out independent GETs
+        self._executor: Optional[ThreadPoolExecutor] = None
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request with error handling and retries"""
+        """Make HTTP request with error handling
+
+        Retries with jittered backoff happen in the mounted adapter, so
+        only the final failure surfaces here.
+        """
         url = f"{self.base_url}{endpoint}"
-        
-        for attempt in range(3):
-            try:
-                response = self.session.request(method, url, timeout=30, **kwargs)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Request failed (attempt {attempt + 1}/3): {e}")
-                if attempt == 2:
-                    raise
-                time.sleep(2 ** attempt)
+
+        try:
+            response = self.session.request(method, url, timeout=30, **kwargs)
+            response.raise_for_status()
+            # orjson parses the raw bytes faster than response.json()
+            return json_utils.loads(response.content)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Request failed after retries: {e}")
+            raise
     
-    def get_agent_profile(self) -> Dict[str, Any]:
+    def get_agent_profile(self) -> AgentProfile:
         """Get authenticated agent profile"""
-        return self._make_request("GET", "/api/agent/profile")
+        return AgentProfile.from_response(self._make_request("GET", "/api/agent/profile"))
     
     def get_balances(self) -> Dict[str, float]:
         """Get agent token balances"""
@@ -57,6 +105,24 @@ class RecallClient:
     def get_portfolio(self) -> Dict[str, Any]:
         """Get agent portfolio information"""
         return self._make_request("GET", "/api/agent/portfolio")
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Fetch balances, portfolio and trade history concurrently
+
+        The three GETs are independent, so issuing them together over the
+        pooled session costs one round-trip instead of three.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4)
+
+        balances_future = self._executor.submit(self.get_balances)
+        portfolio_future = self._executor.submit(self.get_portfolio)
+        history_future = self._executor.submit(self.get_trade_history)
+        return {
+            "balances": balances_future.result(),
+            "portfolio": portfolio_future.result(),
+            "history": history_future.result()
+        }
     
     def get_trade_history(self) -> List[Dict[str, Any]]:
         """Get agent trade history"""
@@ -92,6 +158,7 @@ class RecallClient:
             "slippageTolerance": slippage_tolerance
         }
         
+        self._trade_limiter.acquire()
         logger.info(f"Executing trade: {amount} {from_token} -> {to_token}")
         response = self._make_request("POST", "/api/trade/execute", json=payload)
         
@@ -102,16 +169,30 @@ class RecallClient:
         
         return response
     
+    @staticmethod
+    def _scale_for(symbol: str) -> int:
+        """Get the precomputed 10**decimals factor for a symbol"""
+        scale = TOKEN_SCALE.get(symbol)
+        if scale is None:
+            scale = 10 ** get_token_decimals(symbol)
+        return scale
+
     def to_base_units(self, amount_float: float, symbol: str) -> str:
         """Convert human units to base units for API"""
-        decimals = get_token_decimals(symbol)
-        scaled = Decimal(str(amount_float)) * (10 ** decimals)
-        return str(int(scaled.quantize(Decimal("1"), rounding=ROUND_DOWN)))
-    
+        # Shift the decimal repr of the amount rather than multiplying
+        # floats: a bare float multiply drifts by +/-1 base unit on
+        # values like 2.675 * 10**8. int() truncates toward zero, giving
+        # exact parity with the old ROUND_DOWN quantize. float() first so
+        # NumPy scalars from the rebalance path parse (NumPy 2.x reprs as
+        # "np.float64(...)", which Decimal rejects).
+        decimals = TOKEN_DECIMALS.get(symbol)
+        if decimals is None:
+            decimals = get_token_decimals(symbol)
+        return str(int(Decimal(str(float(amount_float))).scaleb(decimals)))
+
     def from_base_units(self, amount_str: str, symbol: str) -> float:
         """Convert base units to human units"""
-        decimals = get_token_decimals(symbol)
-        return float(Decimal(amount_str) / (10 ** decimals))
+        return int(amount_str) / self._scale_for(symbol)
     
     def health_check(self) -> bool:
         """Check if API is accessible"""
@@ -121,3 +202,15 @@ class RecallClient:
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return False
+
+    def close(self):
+        """Release the pooled session and worker threads"""
+        self.session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+@functools.lru_cache(maxsize=1)
+def get_recall_client() -> RecallClient:
+    """Shared client instance so every caller reuses one warm session"""
+    return RecallClient()
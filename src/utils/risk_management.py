@@ -2,18 +2,83 @@
 Risk Management Module for Trading Agent
 """
 import time
-from typing import Dict, List, Optional, Tuple
+import numpy as np
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from loguru import logger
-from datetime import datetime, timedelta
 
 from .config import config
+from .jit import njit
+
+# Retained trade records; bounds both the deque and the numeric buffer
+HISTORY_SIZE = 1000
+
+# Days of PnL history kept before the oldest entry is evicted
+PNL_HISTORY_DAYS = 30
+
+class TradeRecord(NamedTuple):
+    """One executed trade, kept for auditing and risk tracking"""
+    timestamp: float
+    symbol: str
+    side: str
+    amount: float
+    price: float
+    value: float
+    success: bool
+    reason: str
+
+@njit(cache=True, fastmath=True)
+def _adjust_batch(base, vol, max_pos, reduce_factor):
+    """Position-size adjustment arithmetic over aligned arrays"""
+    out = np.empty_like(base)
+    for i in range(base.size):
+        allocation = base[i]
+        if vol[i] > 0.1:
+            allocation *= min(0.1 / vol[i], 1.0)
+        allocation *= reduce_factor
+        out[i] = min(allocation, max_pos)
+    return out
 
 class RiskManager:
     """Risk management system for trading operations"""
-    
+
+    __slots__ = (
+        "logger", "_tz_offset", "_today_key", "_today_entry",
+        "trade_history", "_trades", "_head", "_count", "_metrics_cache",
+        "daily_pnl", "position_limits", "max_daily_loss",
+        "max_position_size", "stop_loss_pct", "_neg_max_daily_loss"
+    )
+
+    # Static limits shared by every instance
+    max_trades_per_hour = 10
+    min_trade_interval = 60  # seconds
+    _emergency_loss = -0.07  # 7% daily loss
+    _reduce_loss = -0.03  # 3% daily loss
+
     def __init__(self):
         self.logger = logger.bind(component="RiskManager")
-        self.trade_history = []
+        # Day buckets come from integer arithmetic on time.time() rather
+        # than datetime construction; the current bucket is cached
+        self._tz_offset = time.timezone
+        self._today_key: Optional[int] = None
+        self._today_entry: Optional[Dict[str, float]] = None
+        # maxlen evicts the oldest trade for free instead of periodic
+        # list slicing; the numeric fields are mirrored into a
+        # preallocated struct-of-arrays circular buffer so window counts
+        # and reductions run as vectorized passes instead of per-dict
+        # Python loops
+        # ts is the wall-clock audit timestamp; mono comes from
+        # time.monotonic and drives interval checks, immune to NTP jumps
+        self.trade_history = deque(maxlen=HISTORY_SIZE)
+        self._trades = np.zeros(
+            HISTORY_SIZE,
+            dtype=[("ts", "f8"), ("mono", "f8"), ("value", "f8"), ("success", "?")])
+        self._head = 0
+        self._count = 0
+
+        # Metrics computed at most once per second; several checks read
+        # them within a single trade decision
+        self._metrics_cache: Tuple[float, Optional[Dict[str, any]]] = (0.0, None)
         self.daily_pnl = {}
         self.position_limits = {}
         
@@ -21,171 +86,227 @@ class RiskManager:
         self.max_daily_loss = 0.05  # 5% max daily loss
         self.max_position_size = config.max_position_size
         self.stop_loss_pct = config.stop_loss_percentage
-        self.max_trades_per_hour = 10
-        self.min_trade_interval = 60  # seconds
+        # Negated threshold precomputed off the hot path
+        self._neg_max_daily_loss = -self.max_daily_loss
         
         self.logger.info("Risk Manager initialized")
     
     def check_position_size(self, symbol: str, allocation: float, 
                           portfolio_value: float) -> Tuple[bool, str]:
         """Check if position size is within limits"""
-        if allocation > self.max_position_size:
-            return False, f"Position size {allocation:.2%} exceeds limit {self.max_position_size:.2%}"
+        max_position = self.max_position_size
+        if allocation > max_position:
+            return False, f"Position size {allocation:.2%} exceeds limit {max_position:.2%}"
         
         if allocation < 0:
             return False, "Negative position size not allowed"
         
         return True, "Position size OK"
     
-    def check_daily_loss_limit(self, current_portfolio_value: float) -> Tuple[bool, str]:
-        """Check if daily loss limit has been reached"""
-        today = datetime.now().date()
-        
-        if today not in self.daily_pnl:
-            # First trade of the day, record starting value
-            self.daily_pnl[today] = {
-                "start_value": current_portfolio_value,
-                "current_value": current_portfolio_value,
+    def _day_key(self, now: float) -> int:
+        """Local-day bucket for a wall-clock timestamp"""
+        return int((now - self._tz_offset) // 86400)
+
+    def _today(self) -> Optional[Dict[str, float]]:
+        """Return today's PnL entry via the cached day bucket"""
+        today = self._day_key(time.time())
+        if today != self._today_key:
+            self._today_key = today
+            self._today_entry = self.daily_pnl.get(today)
+        return self._today_entry
+
+    def _touch_daily_pnl(self, portfolio_value: float):
+        """Refresh today's PnL entry, creating it on the first update"""
+        entry = self._today()
+        if entry is None:
+            # First update of the day, record starting value
+            entry = {
+                "start_value": portfolio_value,
+                "current_value": portfolio_value,
                 "pnl": 0.0
             }
+            self.daily_pnl[self._today_key] = entry
+            self._today_entry = entry
+            # Day keys insert chronologically, so the first key is the
+            # oldest; evict beyond the retention window
+            while len(self.daily_pnl) > PNL_HISTORY_DAYS:
+                del self.daily_pnl[next(iter(self.daily_pnl))]
+            return
+
+        start_value = entry["start_value"]
+        entry["current_value"] = portfolio_value
+        entry["pnl"] = (portfolio_value - start_value) / start_value
+
+    def check_daily_loss_limit(self, current_portfolio_value: float) -> Tuple[bool, str]:
+        """Check if daily loss limit has been reached
+
+        Pure read on the validation path; the stored entry is only
+        refreshed when a trade is actually recorded.
+        """
+        entry = self._today()
+        if entry is None:
+            # First sight of the day seeds the baseline
+            self._touch_daily_pnl(current_portfolio_value)
             return True, "Daily loss check OK"
-        
-        # Update current value and calculate PnL
-        start_value = self.daily_pnl[today]["start_value"]
-        pnl_pct = (current_portfolio_value - start_value) / start_value
-        
-        self.daily_pnl[today]["current_value"] = current_portfolio_value
-        self.daily_pnl[today]["pnl"] = pnl_pct
-        
-        if pnl_pct < -self.max_daily_loss:
+
+        pnl_pct = (current_portfolio_value - entry["start_value"]) / entry["start_value"]
+
+        if pnl_pct < self._neg_max_daily_loss:
             return False, f"Daily loss limit reached: {pnl_pct:.2%} < -{self.max_daily_loss:.2%}"
         
         return True, f"Daily PnL: {pnl_pct:.2%}"
     
     def check_trade_frequency(self) -> Tuple[bool, str]:
         """Check if trade frequency limits are respected"""
-        now = time.time()
-        
+        now = time.monotonic()
+
         # Check minimum interval since last trade
-        if self.trade_history:
-            last_trade_time = self.trade_history[-1]["timestamp"]
+        if self._count:
+            last_trade_time = self._trades["mono"][(self._head - 1) % HISTORY_SIZE]
             if now - last_trade_time < self.min_trade_interval:
                 return False, f"Minimum trade interval not met: {now - last_trade_time:.0f}s < {self.min_trade_interval}s"
-        
-        # Check hourly trade limit
-        hour_ago = now - 3600
-        recent_trades = [t for t in self.trade_history if t["timestamp"] > hour_ago]
-        
-        if len(recent_trades) >= self.max_trades_per_hour:
-            return False, f"Hourly trade limit reached: {len(recent_trades)} >= {self.max_trades_per_hour}"
-        
+
+        # One vectorized compare over the buffer counts the hourly window
+        recent_count = int((self._trades["mono"][:self._count] > now - 3600).sum())
+
+        if recent_count >= self.max_trades_per_hour:
+            return False, f"Hourly trade limit reached: {recent_count} >= {self.max_trades_per_hour}"
+
         return True, "Trade frequency OK"
     
-    def check_stop_loss(self, symbol: str, current_price: float, 
+    def check_stop_loss(self, symbol: str, current_price: float,
                        entry_price: float, position_type: str) -> Tuple[bool, str]:
         """Check if stop loss should be triggered"""
-        if position_type == "long":
-            loss_pct = (entry_price - current_price) / entry_price
-        else:  # short
-            loss_pct = (current_price - entry_price) / entry_price
-        
+        # +1 for long, -1 for short folds the branch into arithmetic
+        sign = 1.0 if position_type == "long" else -1.0
+        loss_pct = (entry_price - current_price) * sign / entry_price
+
         if loss_pct > self.stop_loss_pct:
             return True, f"Stop loss triggered for {symbol}: {loss_pct:.2%} > {self.stop_loss_pct:.2%}"
-        
+
         return False, f"Stop loss OK for {symbol}: {loss_pct:.2%}"
+
+    def check_stop_loss_batch(self, symbols: List[str], prices: np.ndarray,
+                              entries: np.ndarray, signs: np.ndarray) -> List[Tuple[str, float]]:
+        """Stop-loss sweep over aligned position arrays
+
+        signs holds +1.0 for longs and -1.0 for shorts. Returns
+        (symbol, loss_pct) for every triggered position; one vectorized
+        expression replaces a per-position Python call.
+        """
+        losses = (entries - prices) * signs / entries
+        triggered = losses > self.stop_loss_pct
+        return [(symbols[i], float(losses[i])) for i in np.nonzero(triggered)[0]]
     
-    def validate_trade(self, symbol: str, side: str, amount: float, 
-                      current_price: float, portfolio_value: float) -> Tuple[bool, str]:
-        """Comprehensive trade validation"""
-        # Check position size
-        allocation = (amount * current_price) / portfolio_value
-        size_ok, size_msg = self.check_position_size(symbol, allocation, portfolio_value)
-        if not size_ok:
-            return False, f"Position size check failed: {size_msg}"
-        
-        # Check daily loss limit
-        loss_ok, loss_msg = self.check_daily_loss_limit(portfolio_value)
-        if not loss_ok:
-            return False, f"Daily loss check failed: {loss_msg}"
-        
+    def validate_trade(self, symbol: str, side: str, amount: float,
+                      current_price: float, portfolio_value: float,
+                      notional: Optional[float] = None) -> Tuple[bool, str]:
+        """Comprehensive trade validation
+
+        Checks are ordered cheapest and most decisive first, so the
+        common rejection paths return before any further math runs.
+        Callers that already know the trade's USD notional can pass it
+        to skip the recomputation.
+        """
+        if self.emergency_stop():
+            return False, "Emergency stop active"
+
         # Check trade frequency
         freq_ok, freq_msg = self.check_trade_frequency()
         if not freq_ok:
             return False, f"Trade frequency check failed: {freq_msg}"
-        
+
+        # Check daily loss limit
+        loss_ok, loss_msg = self.check_daily_loss_limit(portfolio_value)
+        if not loss_ok:
+            return False, f"Daily loss check failed: {loss_msg}"
+
+        # Check position size
+        if notional is None:
+            notional = amount * current_price
+        allocation = notional / portfolio_value
+        size_ok, size_msg = self.check_position_size(symbol, allocation, portfolio_value)
+        if not size_ok:
+            return False, f"Position size check failed: {size_msg}"
+
         return True, "All risk checks passed"
     
-    def record_trade(self, symbol: str, side: str, amount: float, 
-                    price: float, success: bool, reason: str = ""):
+    def record_trade(self, symbol: str, side: str, amount: float,
+                    price: float, success: bool, reason: str = "",
+                    value: Optional[float] = None,
+                    portfolio_value: Optional[float] = None):
         """Record a trade for risk tracking"""
-        trade_record = {
-            "timestamp": time.time(),
-            "symbol": symbol,
-            "side": side,
-            "amount": amount,
-            "price": price,
-            "value": amount * price,
-            "success": success,
-            "reason": reason
-        }
-        
-        self.trade_history.append(trade_record)
-        
-        # Keep only last 1000 trades
-        if len(self.trade_history) > 1000:
-            self.trade_history = self.trade_history[-1000:]
-        
-        self.logger.info(f"Recorded trade: {symbol} {side} {amount:.6f} @ {price:.2f}")
-    
+        now = time.time()
+        if value is None:
+            value = amount * price
+        if portfolio_value is not None:
+            self._touch_daily_pnl(portfolio_value)
+        self.trade_history.append(
+            TradeRecord(now, symbol, side, amount, price, value, success, reason))
+        # Mirror the numeric fields into the circular buffer; the oldest
+        # slot is simply overwritten once the buffer is full
+        self._trades[self._head] = (now, time.monotonic(), value, success)
+        self._head = (self._head + 1) % HISTORY_SIZE
+        if self._count < HISTORY_SIZE:
+            self._count += 1
+
+        # New trade invalidates any cached metrics
+        self._metrics_cache = (0.0, None)
+
+        # Positional args defer formatting until the record is emitted
+        self.logger.info("Recorded trade: {} {} {:.6f} @ {:.2f}",
+                         symbol, side, amount, price)
+
     def get_risk_metrics(self) -> Dict[str, any]:
         """Calculate current risk metrics"""
-        if not self.trade_history:
+        if not self._count:
             return {"message": "No trade history available"}
-        
+
         now = time.time()
-        
-        # Recent trade statistics
-        day_ago = now - 86400
-        recent_trades = [t for t in self.trade_history if t["timestamp"] > day_ago]
-        
-        successful_trades = [t for t in recent_trades if t["success"]]
-        failed_trades = [t for t in recent_trades if not t["success"]]
-        
-        # Calculate metrics
+        cached_at, cached = self._metrics_cache
+        if cached is not None and now - cached_at < 1.0:
+            return cached
+
+        # Mask out the 24h window and reduce the columns in C
+        window = self._trades[:self._count]
+        recent = window[window["ts"] > now - 86400]
+        total = int(recent.size)
+        successful = int(recent["success"].sum())
+        volume = float(recent["value"].sum())
+
         metrics = {
-            "total_trades_24h": len(recent_trades),
-            "successful_trades_24h": len(successful_trades),
-            "failed_trades_24h": len(failed_trades),
-            "success_rate_24h": len(successful_trades) / len(recent_trades) if recent_trades else 0,
-            "total_volume_24h": sum(t["value"] for t in recent_trades),
-            "avg_trade_size_24h": sum(t["value"] for t in recent_trades) / len(recent_trades) if recent_trades else 0,
+            "total_trades_24h": total,
+            "successful_trades_24h": successful,
+            "failed_trades_24h": total - successful,
+            "success_rate_24h": successful / total if total else 0,
+            "total_volume_24h": volume,
+            "avg_trade_size_24h": volume / total if total else 0,
         }
         
         # Add daily PnL if available
-        today = datetime.now().date()
-        if today in self.daily_pnl:
-            metrics["daily_pnl"] = self.daily_pnl[today]["pnl"]
-            metrics["daily_pnl_usd"] = (
-                self.daily_pnl[today]["current_value"] - 
-                self.daily_pnl[today]["start_value"]
-            )
-        
+        entry = self.daily_pnl.get(self._day_key(now))
+        if entry is not None:
+            metrics["daily_pnl"] = entry["pnl"]
+            metrics["daily_pnl_usd"] = entry["current_value"] - entry["start_value"]
+
+        self._metrics_cache = (now, metrics)
         return metrics
     
     def should_reduce_risk(self) -> Tuple[bool, str]:
         """Determine if risk should be reduced based on recent performance"""
         metrics = self.get_risk_metrics()
-        
-        # Check success rate
         success_rate = metrics.get("success_rate_24h", 1.0)
-        if success_rate < 0.5 and metrics.get("total_trades_24h", 0) >= 5:
+        total_trades = metrics.get("total_trades_24h", 0)
+        daily_pnl = metrics.get("daily_pnl", 0)
+
+        # Check success rate
+        if success_rate < 0.5 and total_trades >= 5:
             return True, f"Low success rate: {success_rate:.2%}"
-        
+
         # Check daily PnL
-        daily_pnl = metrics.get("daily_pnl", 0)
-        if daily_pnl < -0.03:  # 3% daily loss
+        if daily_pnl < self._reduce_loss:
             return True, f"Significant daily loss: {daily_pnl:.2%}"
-        
+
         return False, "Risk levels acceptable"
     
     def get_adjusted_position_size(self, base_allocation: float, 
@@ -198,19 +319,40 @@ class RiskManager:
         if market_volatility > 0.1:  # 10% volatility
             volatility_factor = min(0.1 / market_volatility, 1.0)
             adjusted_allocation *= volatility_factor
-            self.logger.info(f"Reduced allocation for {symbol} due to high volatility: {volatility_factor:.2f}")
+            self.logger.info("Reduced allocation for {} due to high volatility: {:.2f}",
+                             symbol, volatility_factor)
         
         # Reduce if recent poor performance
         should_reduce, reason = self.should_reduce_risk()
         if should_reduce:
             adjusted_allocation *= 0.5  # Halve position size
-            self.logger.warning(f"Reduced allocation for {symbol} due to risk: {reason}")
+            self.logger.warning("Reduced allocation for {} due to risk: {}",
+                                symbol, reason)
         
         # Ensure within limits
         adjusted_allocation = min(adjusted_allocation, self.max_position_size)
-        
+
         return adjusted_allocation
-    
+
+    def get_adjusted_position_sizes(self, base_allocations: np.ndarray,
+                                    volatilities: np.ndarray) -> np.ndarray:
+        """Batch form of get_adjusted_position_size over aligned arrays
+
+        The poor-performance check runs once for the whole batch and the
+        numeric adjustment happens in the compiled kernel; logging stays
+        out here.
+        """
+        should_reduce, reason = self.should_reduce_risk()
+        if should_reduce:
+            self.logger.warning("Reduced batch allocations due to risk: {}", reason)
+
+        return _adjust_batch(
+            np.asarray(base_allocations, dtype=np.float64),
+            np.asarray(volatilities, dtype=np.float64),
+            self.max_position_size,
+            0.5 if should_reduce else 1.0
+        )
+
     def emergency_stop(self) -> bool:
         """Check if emergency stop should be triggered"""
         metrics = self.get_risk_metrics()
@@ -223,7 +365,7 @@ class RiskManager:
         # Trigger emergency stop if:
         # 1. Daily loss > 7%
         # 2. Success rate < 30% with at least 10 trades
-        if daily_pnl < -0.07:
+        if daily_pnl < self._emergency_loss:
             self.logger.critical(f"EMERGENCY STOP: Daily loss {daily_pnl:.2%}")
             return True
         
@@ -0,0 +1,121 @@
+"""
+Minimal TTL cache for API responses
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from . import json_utils
+
+class TTLCache:
+    """Dict-backed cache whose entries expire after a fixed TTL
+
+    All operations hold an internal lock; the caches are shared across
+    the provider's worker threads.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def _store(self, key, value):
+        """Insert one entry, evicting expired/oldest entries at capacity.
+
+        Caller must hold the lock.
+        """
+        if len(self._data) >= self.maxsize:
+            now = time.time()
+            for k in [k for k, (exp, _) in self._data.items() if exp < now]:
+                del self._data[k]
+            while len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+        self._data[key] = (time.time() + self.ttl, value)
+
+    def set(self, key, value):
+        """Store a value"""
+        with self._lock:
+            self._store(key, value)
+
+    def set_many(self, items: Dict[Any, Any]):
+        """Store several entries as a single operation"""
+        with self._lock:
+            for key, value in items.items():
+                self._store(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class PersistentTTLCache(TTLCache):
+    """TTLCache mirrored to an orjson file so restarts warm-start
+
+    Entries are written as ``[key, expires_at, value]`` rows; tuple keys
+    round-trip through JSON lists. Expiry semantics are identical to the
+    in-memory cache — stale rows are simply dropped on load.
+    """
+
+    def __init__(self, path: str, maxsize: int = 256, ttl: float = 60.0):
+        super().__init__(maxsize, ttl)
+        self.path = path
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                rows = json_utils.loads(f.read())
+        except (FileNotFoundError, json_utils.JSONDecodeError):
+            return
+        now = time.time()
+        with self._lock:
+            for key, expires_at, value in rows:
+                if isinstance(key, list):
+                    key = tuple(key)
+                if expires_at > now:
+                    self._data[key] = (expires_at, value)
+
+    def _flush(self):
+        # Snapshot under the lock so concurrent writers can't mutate the
+        # dict mid-iteration; the file write happens outside it
+        with self._lock:
+            rows = [[list(key) if isinstance(key, tuple) else key, expires_at, value]
+                    for key, (expires_at, value) in self._data.items()]
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(json_utils.dumps(rows))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Persistence is best-effort; the in-memory cache still works
+            pass
+
+    def set(self, key, value):
+        super().set(key, value)
+        self._flush()
+
+    def set_many(self, items: Dict[Any, Any]):
+        # One flush for the whole batch instead of one per entry
+        super().set_many(items)
+        self._flush()
+
+    def clear(self):
+        super().clear()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
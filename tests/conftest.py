@@ -0,0 +1,8 @@
+"""
+Shared test setup
+"""
+import sys
+from pathlib import Path
+
+# Make `src.*` imports resolve when pytest runs from anywhere in the tree
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
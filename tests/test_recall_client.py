@@ -0,0 +1,69 @@
+"""
+Tests for base-unit conversion in the Recall client
+"""
+from decimal import Decimal, ROUND_DOWN
+
+import numpy as np
+import pytest
+
+from src.utils.config import TOKEN_DECIMALS
+from src.utils.recall_client import RecallClient
+
+# Edge cases plus a spread of magnitudes per asset; 2.675 is the classic
+# float whose scaled value drifts by one base unit under a bare multiply
+REPRESENTATIVE_AMOUNTS = [
+    0.0,
+    1e-18,
+    1e-8,
+    0.1,
+    2.675,
+    0.123456789012345678,
+    1.0,
+    999.999999,
+    12345.678901234567,
+    1e6,
+]
+
+
+def old_to_base_units(amount: float, decimals: int) -> str:
+    """The original Decimal path: multiply then quantize ROUND_DOWN"""
+    quantized = (Decimal(str(amount)) * (10 ** decimals)).quantize(
+        Decimal("1"), rounding=ROUND_DOWN
+    )
+    return str(int(quantized))
+
+
+@pytest.fixture(scope="module")
+def client():
+    client = RecallClient()
+    yield client
+    client.close()
+
+
+@pytest.mark.parametrize("symbol", sorted(TOKEN_DECIMALS))
+@pytest.mark.parametrize("amount", REPRESENTATIVE_AMOUNTS)
+def test_to_base_units_matches_old_decimal_path(client, symbol, amount):
+    decimals = TOKEN_DECIMALS[symbol]
+    assert client.to_base_units(amount, symbol) == old_to_base_units(amount, decimals)
+
+
+@pytest.mark.parametrize("symbol", sorted(TOKEN_DECIMALS))
+def test_to_base_units_accepts_numpy_scalars(client, symbol):
+    # calculate_rebalancing_trades derives amounts from NumPy arrays, so
+    # conversion must handle np.float64 the same as a plain float (NumPy
+    # 2.x reprs these as "np.float64(...)", which Decimal cannot parse)
+    decimals = TOKEN_DECIMALS[symbol]
+    amounts = np.asarray(REPRESENTATIVE_AMOUNTS, dtype=np.float64)
+    prices = np.full_like(amounts, 1.0)
+    for i in range(len(amounts)):
+        value = amounts[i] / prices[i]
+        assert isinstance(value, np.float64)
+        assert client.to_base_units(value, symbol) == old_to_base_units(
+            float(value), decimals
+        )
+
+
+def test_base_unit_round_trip(client):
+    base = client.to_base_units(2.675, "WBTC")
+    assert base == "267500000"
+    assert client.from_base_units(base, "WBTC") == pytest.approx(2.675)